@@ -37,6 +37,9 @@ import sys
 #def get_zip_fs_dict(fs_):
 #    return {i: fs_.read(i) for i in fs_.namelist()}
 
+_UNSAFE_CHARS_RE = re.compile(r'[^\w_. -/\\)(]')
+_PARENT_DIR_RE = re.compile(r'^\.\./|\.\.\\')
+
 def _sanitize_filename(filename):
     r'''Sanitize filename.
 
@@ -44,11 +47,10 @@ def _sanitize_filename(filename):
     (r'\w'), or any characters [_. -/\()] (not including the brackets).
     Then, keep removing '../' and r'..\' until the result is unchanged.
     '''
-    replace_re = re.compile(r'^\.\./|\.\.\\')
-    filename = re.sub(r'[^\w_. -/\\)(]', '', filename)
+    filename = _UNSAFE_CHARS_RE.sub('', filename)
     new_filename = ''
     while True:
-        new_filename = replace_re.sub('', filename)
+        new_filename = _PARENT_DIR_RE.sub('', filename)
         if filename == new_filename:
             break
         else:
@@ -80,6 +80,13 @@ contained in the `NOT_VERB_STEM` list.
 Finally, 'ß' is replaced in the regex in any of the above steps by
 '(ß|ss)'.
 
+Before a regex is searched for in a sentence, we check that the sentence
+contains literal text that every match of the regex must contain (or, for
+a regex with alternatives, the text of one of the alternatives; see
+`_required_literals`). This check is a substring search that
+is much faster than the regex search, and for most regexes it rejects most
+sentences.
+
 An input regex of 'MANUAL_REVIEW' is ignored by this module. This can be
 used as an indicator that the input regexes may be too sensitive
 (i.e., cast too wide a net) and the output counts may need to be corrected.
@@ -93,13 +100,13 @@ __all__ = ['mpi_count_regexes']
 
 import csv
 from dataclasses import dataclass, field
-from functools import partial
+from functools import cache, partial
+from itertools import islice
 from mpi4py.futures import MPIPoolExecutor, get_comm_workers
 import re
+import string
 import warnings
 
-import pandas as pd
-
 #------------------------------------------------------------------------------
 # Parameters
 #------------------------------------------------------------------------------
@@ -111,9 +118,9 @@ warnings.filterwarnings('ignore', 'This pattern has match groups')
 # Input regexes that meet other criteria as 'probable verb stems' but are not
 # treated as such. Recall that 'probable verb stems' do not have their first
 # letter optionally capitalized or word boundaries added to the regex.
-NOT_VERB_FRAGMENTS = ['bei','bekannt','gebunden','geduldig','gefressen',
-                      'gestochen','gut','herum','keiner','los','mitgefangen',
-                      'mitgehangen','sicher','weg','zusammen']
+NOT_VERB_FRAGMENTS = frozenset(['bei','bekannt','gebunden','geduldig',
+                      'gefressen','gestochen','gut','herum','keiner','los',
+                      'mitgefangen','mitgehangen','sicher','weg','zusammen'])
 
 # entries that start with underscore are for use in separable verbs, so they
 # do not have the '\b' to mark the start of the word boundary for the present
@@ -129,6 +136,106 @@ PREP_OR_ES_SET = frozenset(['auf','an','aus','außer','bei','gegenüber',
             'hinter','in','mit', 'nach','neben','seit','statt','trotz','über',
             'unter','von','vor','wegen','während','zwischen','zu','es'])
 
+# Regexes for the prepositions that contract with a following definite
+# article, used by `_add_da_and_caps`. Since we are adding word boundaries to
+# the end of the prep, handle common contractions too.
+# Inspected cohorts to see if '`' needs to be handled in the
+# abbreviations. Does not seem necessary
+PREP_CONTRACTIONS = {
+    'an': 'a(n(s)?|m)',
+    'in': 'i(n(s)?|m)',
+    'bei': 'beim?',
+    'hinter': "hinter('?[ms])?",
+    'über': "über('?[mns])?",
+    'unter': "unter('?[mns])?",
+    'vor': "vor('?[ms])?",
+    'auf': "auf('?[mns])?",
+    'außer': 'außer[ms]?',
+    'nach': "nach('?[ms])?",
+    'von': 'vo[nm]',
+    'zu': 'zu[mr]?',
+}
+
+_VOWELS = frozenset('aeiouäöü')
+
+# Replacements for 'SICH' + suffix placeholders, used by
+# `_replace_sichdab_forms`.
+SICH_FORMS = {
+    'D': r'([Ss]ich|[Dd]ir|mir|uns|euch)',
+    'A': r'([Ss]ich|[Dd]ich|mich|uns|euch)',
+    'B': r'([Ss]ich|[Dd]ich|[Dd]ir|mich|mir|uns|euch)',
+}
+
+# Replacements for 'SEIN' + suffix placeholders, used by
+# `_replace_sein_forms`.
+SEIN_FORMS = {
+    'MN':    # masc. nom.
+        r'(\b[MDSmds]ein\b|\b[Ii]hr\b|\b[Uu]nser\b)',
+    'NN':    # neut. nom.
+        r'(\b[MDSmds]ein\b|\b[Ii]hr\b|\b[Uu]nser\b)',
+    'FN':    # fem. nom.
+        r'(\b[MDSmds]eine\b|\b[Ii]hre\b|\b[Uu]nsere\b)',
+    'PN':    # pl. nom.
+        r'(\b[MDSmds]eine\b|\b[Ii]hre\b|\b[Uu]nsere\b)',
+    'MA':    # masc. acc.
+        r'(\b[MDSmds]einen\b|\b[Ii]hren\b|\b[Uu]nseren\b)',
+    'NA':    # neut. acc.
+        r'(\b[MDSmds]ein\b|\b[Ii]hr\b|\b[Uu]nser\b)',
+    'FA':    # fem. acc.
+        r'(\b[MDSmds]eine\b|\b[Ii]hre\b|\b[Uu]nsere\b)',
+    'PA':    # pl. acc.
+        r'(\b[MDSmds]eine\b|\b[Ii]hre\b|\b[Uu]nsere\b)',
+    'MND':   # masc./neut. dat.
+        r'(\b[MDSmds]einem\b|\b[Ii]hrem\b|\b[Uu]nserem\b)',
+    'FD':    # fem. dat.
+        r'(\b[MDSmds]einer\b|\b[Ii]hrer\b|\b[Uu]nserer\b)',
+    'PD':    # pl. dat.
+        r'(\b[MDSmds]einen\b|\b[Ii]hren\b|\b[Uu]nseren\b)',
+    'G':     # gen.
+        r'(\b[MDSmds]einer\b|\b[Ii]hrer\b|\b[Uu]nserer\b)',
+    'MNG':   # masc./neut. gen.
+        r'(\b[MDSmds]eines\b|\b[Ii]hres\b|\b[Uu]nseres\b)',
+    'FG':    # fem. gen.
+        r'(\b[MDSmds]einer\b|\b[Ii]hrer\b|\b[Uu]nserer\b)',
+    'PG':    # pl. gen.
+        r'(\b[MDSmds]einer\b|\b[Ii]hrer\b|\b[Uu]nserer\b)',
+}
+
+# All placeholders are replaced in one pass. The longest suffixes are tried
+# first so that, e.g., 'SEINMND' is not replaced as 'SEINMN' + 'D'.
+_SICH_FORM_RE = re.compile('SICH([DAB])')
+_SEIN_FORM_RE = re.compile('SEIN('
+                    + '|'.join(sorted(SEIN_FORMS, key=len, reverse=True))
+                    + ')')
+
+# Characters that can be part of the literals returned by `_required_literals`.
+# A case-insensitive match of any of these in a sentence is found by a
+# substring search of the sentence after it is translated with `_FOLD_TABLE`
+# and lower-cased.
+_LITERAL_CHARS = frozenset(string.ascii_letters + string.digits
+                           + "ÄÖÜäöüß -'")
+# Translation table that deletes the characters allowed in placeholders
+# (e.g., 'SCHLIEẞEN', '_STOẞEN'). This is faster than checking
+# `char.isupper()` for each character.
+_DELETE_CAPS_AND_UNDERSCORE = str.maketrans('', '',
+                                           string.ascii_uppercase + 'ÄÖÜẞ_')
+# A case-insensitive regex matches these to 'i' or 's', but `str.lower()`
+# does not.
+_FOLD_TABLE = str.maketrans({'İ': 'i', 'ı': 'i', 'ſ': 's'})
+_ESCAPE_RE = re.compile(r'\\(x[0-9a-fA-F]{2}|u[0-9a-fA-F]{4}|U[0-9a-fA-F]{8}'
+                        r'|N\{[^}]*\}|\d{1,3}|.)', flags=re.DOTALL)
+_BRACES_QUANTIFIER_RE = re.compile(r'\{\d*(,\d*)?\}')
+_ASCII_LETTERS_AND_DIGITS = frozenset(string.ascii_letters + string.digits)
+# Escapes and extension headers (e.g., '(?P<name>', '(?P=name)') that
+# `_lower_pattern` does not lower-case.
+_LOWER_PATTERN_SKIP_RE = re.compile(
+        r'\\(.)|\(\?(P<\w+>|P=\w+\)|\(\w+\)|[aiLmsux]*(-[imsx]*)?[:)])',
+        flags=re.DOTALL)
+# Escapes that can stand for capital letters (including octal escapes such
+# as r'\101') and inline flag groups (e.g., '(?-i:...)'). Patterns with these
+# are not lower-cased.
+_KEEP_IGNORECASE_RE = re.compile(r'\\[xuUN0-9]|\(\?[aiLmsux-]+[:)]')
+
 #------------------------------------------------------------------------------
 # Classes
 #------------------------------------------------------------------------------
@@ -140,13 +247,7 @@ class IdiomReadRec:
     headword: str = ''
     regexes: list = field(default_factory=list)
     ic_regexes: list = field(default_factory=list)
-
-@dataclass
-class IdiomWriteRec:
-    '''Idiom information the worker threads will need to write to.
-    '''
-    results: list = field(default_factory=list)
-    ic_results: list = field(default_factory=list)
+    literals: list = field(default_factory=list)
 
 #------------------------------------------------------------------------------
 # Globals
@@ -160,47 +261,55 @@ class IdiomWriteRec:
 #
 # Workers communication object.
 _COMM_WORKERS = None
-# These are global for efficiency reasons. The _IDIOM_READONLY won't change
+# These are global for efficiency reasons. The _GROUPS won't change
 # for each execution of a worker task so we choose not to send it as an
-# argument for each task. The IDIOM_COUNTS will be updated for each worker task
+# argument for each task. The _COUNTS will be updated for each worker task
 # but we want it to maintain state across the task executions within each
 # process. The alternative is sending the results out for each task, but this
 # is too much interprocess communication and will be significantly slower.
 #
-# This is a list that the worker processes only need to read from. Each element
-# is a 2-tuple and each element in the tuple is an `IdiomReadRec` object. Every
-# row in the input idiom file is added to the list.
-_IDIOM_READONLY = None
-# Like above, but the workers will need to write to it. Each element in the
-# tuple is a `IdiomWriteRec`.
-_IDIOM_COUNTS = None
+# This is a list that the worker processes only need to read from, with a
+# tuple for each non-empty regex group. See `_worker_groups`.
+_GROUPS = None
+# Flat list of counts that the workers write to, in the order given by
+# `_count_positions`.
+_COUNTS = None
+# A dict from each distinct required literal of the first regexes in the
+# groups to the indices of the groups in `_GROUPS` with that literal. A group
+# can only match a sentence that contains one of the literals of its first
+# regex, so the workers find the literals in the sentence and only loop over
+# the groups for those literals.
+_GROUPS_BY_LITERAL = None
+# The literals in `_GROUPS_BY_LITERAL` in a dict by their first
+# `_PREFIX_LEN` characters, and a list of the shorter literals. Only the
+# literals whose prefix is in the sentence need to be searched for.
+_FIRST_LITERALS_BY_PREFIX = None
+_SHORT_FIRST_LITERALS = None
+_PREFIX_LEN = 3
 # Non-None value used to indicate that text should be written to the match
-# file, and the workers should return a list of the text to write. Otherwise,
-# the workers return `None`.
+# file, and the workers should return the text to write. Otherwise, the
+# workers return `None`.
 _MATCH_FILE = None
 
 #------------------------------------------------------------------------------
 # Functions
 #------------------------------------------------------------------------------
+@cache
 def _all_caps_or_underscore(x):
-    for char in x:
-        if not (char.isupper() or char == '_'): return False
-    return True
+    return not x.translate(_DELETE_CAPS_AND_UNDERSCORE)
 
+@cache
 def _replace_sichdab_forms(x):
     '''Replace SICHD, SICHA, SICHB in strings with reflexive pronuons.
     '''
-    ret_x = x
-    ret_x = ret_x.replace('SICHD', r'([Ss]ich|[Dd]ir|mir|uns|euch)')
-    ret_x = ret_x.replace('SICHA', r'([Ss]ich|[Dd]ich|mich|uns|euch)')
-    ret_x = ret_x.replace('SICHB',
-                          r'([Ss]ich|[Dd]ich|[Dd]ir|mich|mir|uns|euch)')
+    ret_x = _SICH_FORM_RE.sub(lambda m: SICH_FORMS[m[1]], x)
 
     if 'SICH' in ret_x:
         raise ValueError(f'SICH substitution not done in {x=})')
 
     return _add_caps(ret_x)
 
+@cache
 def _replace_sein_forms(x):
     '''Replace SEIN in strings with mein, sein, ihr, usw.xi
 
@@ -212,78 +321,25 @@ def _replace_sein_forms(x):
     if 'SICH' in x:
         # since we use if, elif when processing
         raise ValueError(f'SEIN.. and SICH.. in same regex {x=} not supported')
-    ret_x = x
-    ret_x = ret_x.replace('SEINMN',    # masc. nom.
-                          r'(\b[MDSmds]ein\b|\b[Ii]hr\b|\b[Uu]nser\b)')
-    ret_x = ret_x.replace('SEINNN',    # neut. nom.
-                          r'(\b[MDSmds]ein\b|\b[Ii]hr\b|\b[Uu]nser\b)')
-    ret_x = ret_x.replace('SEINFN',    # fem. nom.
-                          r'(\b[MDSmds]eine\b|\b[Ii]hre\b|\b[Uu]nsere\b)')
-    ret_x = ret_x.replace('SEINPN',    # pl. nom.
-                          r'(\b[MDSmds]eine\b|\b[Ii]hre\b|\b[Uu]nsere\b)')
-    ret_x = ret_x.replace('SEINMA',    # masc. acc.
-                          r'(\b[MDSmds]einen\b|\b[Ii]hren\b|\b[Uu]nseren\b)')
-    ret_x = ret_x.replace('SEINNA',    # neut. acc.
-                          r'(\b[MDSmds]ein\b|\b[Ii]hr\b|\b[Uu]nser\b)')
-    ret_x = ret_x.replace('SEINFA',    # fem. acc.
-                          r'(\b[MDSmds]eine\b|\b[Ii]hre\b|\b[Uu]nsere\b)')
-    ret_x = ret_x.replace('SEINPA',    # pl. acc.
-                          r'(\b[MDSmds]eine\b|\b[Ii]hre\b|\b[Uu]nsere\b)')
-    ret_x = ret_x.replace('SEINMND',   # masc./neut. dat.
-                          r'(\b[MDSmds]einem\b|\b[Ii]hrem\b|\b[Uu]nserem\b)')
-    ret_x = ret_x.replace('SEINFD',     # fem. dat.
-                          r'(\b[MDSmds]einer\b|\b[Ii]hrer\b|\b[Uu]nserer\b)')
-    ret_x = ret_x.replace('SEINPD',    # pl. dat.
-                          r'(\b[MDSmds]einen\b|\b[Ii]hren\b|\b[Uu]nseren\b)')
-    ret_x = ret_x.replace('SEING',     # gen.
-                          r'(\b[MDSmds]einer\b|\b[Ii]hrer\b|\b[Uu]nserer\b)')
-    ret_x = ret_x.replace('SEINMNG',   # masc./neut. gen.
-                          r'(\b[MDSmds]eines\b|\b[Ii]hres\b|\b[Uu]nseres\b)')
-    ret_x = ret_x.replace('SEINFG',     # fem. gen.
-                          r'(\b[MDSmds]einer\b|\b[Ii]hrer\b|\b[Uu]nserer\b)')
-    ret_x = ret_x.replace('SEINPG',     # pl. gen.
-                          r'(\b[MDSmds]einer\b|\b[Ii]hrer\b|\b[Uu]nserer\b)')
+    ret_x = _SEIN_FORM_RE.sub(lambda m: SEIN_FORMS[m[1]], x)
     if 'SEIN' in ret_x:
         raise ValueError(f'SEIN substitution not done in {x=})')
 
     return _add_caps(ret_x)
 
+@cache
 def _add_da_and_caps(x):
+    '''Return the regex for a preposition or 'es' (see module docstring).
+
+    Only called for members of `PREP_OR_ES_SET`, so the results are cached
+    and each expansion is built once.
+    '''
     orig_val = x
     # aus -> \b([Dd]a?r)?[Aa]us\b
-    # Since we are adding word boundaries to the end of the prep, handle
-    # common contractions too
-    # inspected cohorts to see if '`' needs to be handled in the
-    # abbreviations. Does not seem necessary
-    if x == 'an':
-        x = 'a(n(s)?|m)'
-    elif x == 'in':
-        x = 'i(n(s)?|m)'
-    elif x == 'bei':
-        x = 'beim?'
-    elif x == 'hinter':
-        x = "hinter('?[ms])?"
-    elif x == 'über':
-        x = "über('?[mns])?"
-    elif x == 'unter':
-        x = "unter('?[mns])?"
-    elif x == 'vor':
-        x = "vor('?[ms])?"
-    elif x == 'auf':
-        x = "auf('?[mns])?"
-    elif x == 'außer':
-        x = 'außer[ms]?'
-    elif x == 'nach':
-        x = "nach('?[ms])?"
-    elif x == 'von':
-        x = 'vo[nm]'
-    elif x == 'es':
-        x = r'`s\b|\b[Ee]s\b'
-        return x
-    elif x == 'zu':
-        x = 'zu[mr]?'
-    start_vowel = re.compile('^[aeiouäöü]')
-    starts_w_vowel = start_vowel.search(x)
+    if x == 'es':
+        return r'`s\b|\b[Ee]s\b'
+    x = PREP_CONTRACTIONS.get(x, x)
+    starts_w_vowel = x[0] in _VOWELS
     make_cap = '[' + x[0].upper() + x[0] + ']' + x[1:] + r'\b'
     #make_cap = '(^' + x[0].upper() + '|' + x[0] + ')' + x[1:] + r'\b'
     if starts_w_vowel:
@@ -292,6 +348,7 @@ def _add_da_and_caps(x):
         res = r'\b[Dd]a' + orig_val + r'\b|\b' + make_cap
     return res
 
+@cache
 def _add_caps(x):
     if x[0].isupper() or not x[0].isalpha():
         return r'\b' + x + r'\b'
@@ -299,23 +356,133 @@ def _add_caps(x):
         return r'\b[' + x[0].upper() + x[0] + ']' + x[1:] + r'\b'
         #return r'\b(^' + x[0].upper() + '|' + x[0] + ')' + x[1:] + r'\b'
 
-def _ext_seq(seq, n):
-    if seq:
-        return seq + ' -> ' + str(n)
-    else:
-        return str(n)
+@cache
+def _compile(regex, flags=0):
+    r'''Compile a regex that will be searched for in the corpora.
+
+    All such regexes are compiled here so the engine only needs to be changed
+    in one place. We use the standard `re` module: RE2 (and the bindings
+    built on it) treats only ASCII characters as word characters, so a
+    pattern like r'\b[Üü]ber\b' would no longer match 'über'.
+
+    Identical regexes return the same pattern object, which lets
+    `_process_corpus_row` search for each distinct regex only once per
+    sentence.
+    '''
+    return re.compile(regex, flags=flags)
+
+@cache
+def _lower_pattern(regex):
+    r'''Return `regex` with its letters lower-cased, except in escapes and
+    extension headers.
+
+    Escapes of ASCII letters and digits (e.g., r'\b', r'\w') and headers such
+    as '(?P<name>' are kept as they are. See `_compile_ic`.
+    '''
+    parts = []
+    pos = 0
+    for skip in _LOWER_PATTERN_SKIP_RE.finditer(regex):
+        parts.append(regex[pos:skip.start()].lower())
+        escaped = skip.group(1)
+        if escaped is not None and escaped not in _ASCII_LETTERS_AND_DIGITS:
+            parts.append(skip.group().lower())
+        else:
+            parts.append(skip.group())
+        pos = skip.end()
+    parts.append(regex[pos:].lower())
+    return ''.join(parts)
+
+def _compile_ic(regex):
+    r'''Compile the case-insensitive version of `regex`.
+
+    The result is usually the lower-cased regex, which is searched for in the
+    lower-cased sentence. This is faster than using `re.IGNORECASE`, but it
+    does not work if the regex has numeric escapes such as r'\x41' or r'\101'
+    or named ones such as r'\N{...}' that can stand for capital letters, or
+    inline flags such as '(?-i:...)'. Such regexes are compiled with
+    `re.IGNORECASE` and searched for in the original sentence (see
+    `_is_lower_cased`).
+    '''
+    if _KEEP_IGNORECASE_RE.search(regex):
+        return _compile(regex, flags=re.IGNORECASE)
+    return _compile(_lower_pattern(regex))
+
+@cache
+def _required_literals(pattern):
+    r'''Return a tuple of literal texts such that every match of `pattern`
+    has at least one of them.
+
+    The texts are lower-cased, and the tuple is ('',) if nothing was found.
+    Only the top level of the regex is inspected: groups, character classes,
+    escapes, and characters made optional by a quantifier are skipped. If
+    there is an alternation at the top level, the longest literal of each
+    alternative is returned, except that a literal is dropped if it contains
+    another one (e.g., r'\bmach|\bgemacht' gives ('mach',)).
+    '''
+    regex = pattern.pattern
+    if pattern.flags & re.VERBOSE:
+        return ('',)
+    literals = []
+    runs = ['']
+    depth = 0
+    last_in_run = False
+    i = 0
+    while i < len(regex):
+        char = regex[i]
+        in_run = False
+        if char == '\\':
+            i = _ESCAPE_RE.match(regex, i).end() - 1
+        elif char == '[':
+            i += 1
+            if regex.startswith('^', i):
+                i += 1
+            if regex.startswith(']', i):
+                i += 1
+            while i < len(regex) and regex[i] != ']':
+                if regex[i] == '\\':
+                    i += 1
+                i += 1
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == '|' and depth == 0:
+            literals.append(max(runs, key=len).lower())
+            runs = ['']
+        elif char in '?*+{':
+            if char == '{':
+                quant = _BRACES_QUANTIFIER_RE.match(regex, i)
+                if quant:
+                    i = quant.end() - 1
+            if char != '+' and last_in_run:
+                runs[-1] = runs[-1][:-1]
+            if regex.startswith(('?','+'), i + 1):
+                i += 1
+        elif depth == 0 and char in _LITERAL_CHARS:
+            runs[-1] += char
+            in_run = True
+        if not in_run and runs[-1]:
+            runs.append('')
+        last_in_run = in_run
+        i += 1
+    literals.append(max(runs, key=len).lower())
+    if '' in literals:
+        return ('',)
+    return tuple(literal for idx, literal in enumerate(literals)
+                 if literal not in literals[:idx]
+                 and not any(other in literal for other in literals
+                             if len(other) < len(literal)))
 
 # ctr and note_id are currently unused but might be wanted when debugging
 def _process_one_re(headword, relist_as_str, prob_verb_stems, verb_forms,
-                    idiom_readonly, idiom_counts, re_idx):
+                    idiom_readonly, re_idx):
     if re_idx == 1:
         idiom_readonly.append((IdiomReadRec(),IdiomReadRec()))
-        idiom_counts.append((IdiomWriteRec(),IdiomWriteRec()))
 
     if not relist_as_str or relist_as_str == 'EXCLUDE':
         return
         #return {'n_cum': 0, 'n_seq': '', 'n_ic_cum': 0, 'n_ic_seq': ''}
-    re_list = relist_as_str.split('+')
+    re_list = [regex.strip() for regex in relist_as_str.split('+')]
 
     # The commented-out code is from a draft version of this program where
     # vectorized pandas functions were used, e.g. 3.5 hr run-time vs 2.75 hr.
@@ -327,28 +494,29 @@ def _process_one_re(headword, relist_as_str, prob_verb_stems, verb_forms,
     #n_ic_cum = 0
     #n_ic_seq = ''
     re_list_len = len(re_list)
-    last_man_rev = re_list and 'MANUAL_REVIEW' == re_list[-1].strip()
-    last_non_sich_index = 0
+    last_man_rev = re_list and 'MANUAL_REVIEW' == re_list[-1]
+    last_non_sich_index = next((list_pos
+                                for list_pos in reversed(range(re_list_len))
+                                if re_list[list_pos] not in
+                                   ('MANUAL_REVIEW','SICH')), 0)
+    # Whether the list is long enough for a verb stem to be recognized.
+    can_have_verb_stem = re_list_len > 1 or re_list_len > 2 and last_man_rev
     has_verb_form = False
     has_prob_verb_stem = False
-    for list_pos, regex in enumerate(re_list):
-        if regex.strip() not in ['MANUAL_REVIEW','SICH']:
-            last_non_sich_index = list_pos
 
     for list_pos, regex in enumerate(re_list):
-        regex = regex.strip()
-        prob_verb_stem = (' ' not in regex
+        prob_verb_stem = (can_have_verb_stem
+                    and list_pos == last_non_sich_index
+                    and ' ' not in regex
                     and (regex[0].islower()
-                         or (regex[0:2] == r'\b' and regex[2].islower()))
-                    and regex not in NOT_VERB_FRAGMENTS
-                    and ( ( re_list_len > 1
-                            or re_list_len > 2 and last_man_rev))
-                    and list_pos == last_non_sich_index)
-        if prob_verb_stem and not _all_caps_or_underscore(regex):
+                         or (regex.startswith(r'\b') and regex[2].islower()))
+                    and regex not in NOT_VERB_FRAGMENTS)
+        is_placeholder = _all_caps_or_underscore(regex)
+        if prob_verb_stem and not is_placeholder:
             if regex.upper() + 'EN' in verb_forms:
                 print (f'WARNING: {regex=} also in verb_forms')
             _add_to_prob_verb_stems(prob_verb_stems, regex, headword)
-        if regex and _all_caps_or_underscore(regex):
+        if regex and is_placeholder:
             if (regex[0] != '_' and regex != 'MANUAL_REVIEW'
                 and not (' ' + regex.lower() in headword
                          or headword.startswith(regex.lower()))):
@@ -377,7 +545,7 @@ def _process_one_re(headword, relist_as_str, prob_verb_stems, verb_forms,
               and '[' not in regex and r'\b' not in regex
               and not prob_verb_stem):
             regex = _add_caps(regex)
-        regex.replace('ß','(ß|ss)')
+        regex = regex.replace('ß', '(ß|ss)')
 
         if prob_verb_stem:
             has_prob_verb_stem = True
@@ -396,13 +564,16 @@ def _process_one_re(headword, relist_as_str, prob_verb_stems, verb_forms,
         else:
             verb_search_cat = ''
         ir_rec = idiom_readonly[-1][re_idx-1]
-        iw_rec = idiom_counts[-1][re_idx-1]
         ir_rec.headword = headword
         ir_rec.verb_search_cat = verb_search_cat
-        ir_rec.regexes.append(re.compile(regex))
-        ir_rec.ic_regexes.append(re.compile(regex, flags=re.IGNORECASE))
-        iw_rec.results.append(0)
-        iw_rec.ic_results.append(0)
+        ir_rec.regexes.append(_compile(regex))
+        ir_rec.ic_regexes.append(_compile_ic(regex))
+        if _is_lower_cased(ir_rec.ic_regexes[-1]):
+            ir_rec.literals.append(_required_literals(ir_rec.ic_regexes[-1]))
+        else:
+            # The literals are looked for in the lower-cased sentence, so
+            # they are not used for regexes searched for in the original.
+            ir_rec.literals.append(('',))
         #result = result[ result.str.contains(regex)]
         #n_cum = len(result)
         #n_seq = _ext_seq(n_seq, n_cum)
@@ -415,43 +586,108 @@ def _process_one_re(headword, relist_as_str, prob_verb_stems, verb_forms,
     #return {'n_cum': n_cum, 'n_seq': n_seq,
     #        'n_ic_cum': n_ic_cum, 'n_ic_seq': n_ic_seq}
 
-def _fmt_one_output(idx_, idiom_readonly, idiom_counts, re_idx):
-    #n_cum = 0
-    n_cum = ''
-    n_seq = ''
-    #n_ic_cum = 0
-    n_ic_cum = ''
-    n_ic_seq = ''
+def _fmt_one_output(idx_, idiom_readonly, counts, positions, re_idx):
     #i_rec = rl_entry[re_idx-1]
     ir_rec = idiom_readonly[idx_][re_idx-1]
-    i_rec = idiom_counts[idx_][re_idx-1]
-    for result in i_rec.ic_results:
-        n_ic_cum = str(result)
-        n_ic_seq = _ext_seq(n_ic_seq, n_ic_cum)
-    for result in i_rec.results:
-        n_cum = str(result)
-        n_seq = _ext_seq(n_seq, n_cum)
+    start = positions[idx_][re_idx-1]
+    n_regexes = len(ir_rec.regexes)
+    results = counts[start:start + n_regexes]
+    ic_results = counts[start + n_regexes:start + 2 * n_regexes]
+    # The cumulative count is the last in the sequence, or '' if no regexes.
+    n_ic_seq = ' -> '.join(map(str, ic_results))
+    n_ic_cum = str(ic_results[-1]) if ic_results else ''
+    n_seq = ' -> '.join(map(str, results))
+    n_cum = str(results[-1]) if results else ''
     return {'n_cum': n_cum, 'n_seq': n_seq,
             'n_ic_cum': n_ic_cum, 'n_ic_seq': n_ic_seq,
             'verb_search_cat': ir_rec.verb_search_cat}
 
-def _fmt_output(rl_entry, idiom_readonly, idiom_counts):
+def _fmt_output(rl_entry, idiom_readonly, counts, positions):
     return {'re1': _fmt_one_output(rl_entry,
-                                   idiom_readonly, idiom_counts, 1),
+                                   idiom_readonly, counts, positions, 1),
             're2': _fmt_one_output(rl_entry,
-                                   idiom_readonly, idiom_counts, 2)}
+                                   idiom_readonly, counts, positions, 2)}
 
-def _return_results(_):
-    return _COMM_WORKERS.reduce(_IDIOM_COUNTS, op=_sum_counts)
+def _count_positions(idiom_readonly):
+    '''Return the positions of the counts in the flat list of counts.
+
+    All counts are kept in a single flat list. Each group of regexes has the
+    case-sensitive counts of its regexes followed by the case-insensitive
+    counts. Returns a list with a 2-tuple for each element of
+    `idiom_readonly` that gives the position of the counts of the `re1` and
+    `re2` groups, and the length of the list of counts.
+    '''
+    positions = []
+    pos = 0
+    for row_rec in idiom_readonly:
+        row_positions = []
+        for i_rec in row_rec:
+            row_positions.append(pos)
+            pos += 2 * len(i_rec.regexes)
+        positions.append(tuple(row_positions))
+    return positions, pos
+
+def _is_lower_cased(ic_regex):
+    '''Return whether `ic_regex` from `_compile_ic` is searched for in the
+    lower-cased sentence.
+    '''
+    return not ic_regex.flags & re.IGNORECASE
+
+def _worker_groups(idiom_readonly, positions):
+    '''Return the regex groups in the form searched by the workers.
+
+    The result has a tuple for each group with at least one regex. It has a
+    tuple for each regex in the group: (literals, ic_regex, ic_lower_cased,
+    regex, ic_result_pos, result_pos, headword). `ic_lower_cased` is whether
+    `ic_regex` is searched for in the lower-cased sentence (see
+    `_compile_ic`). The `*_pos` values are the
+    positions of the regex's counts in the flat list of counts (see
+    `_count_positions`). The headword is `None` except for the last regex of
+    `re1` groups, as only those matches are written to the match file. This
+    lets the workers loop over one flat list instead of looking up the
+    records of each idiom, and skip the idioms without a `re2` group.
+    '''
+    groups = []
+    for row_rec, row_positions in zip(idiom_readonly, positions):
+        for idx2, (i_rec, pos) in enumerate(zip(row_rec, row_positions)):
+            n_regexes = len(i_rec.regexes)
+            if n_regexes:
+                groups.append(tuple(
+                    (i_rec.literals[re_idx], i_rec.ic_regexes[re_idx],
+                     _is_lower_cased(i_rec.ic_regexes[re_idx]),
+                     i_rec.regexes[re_idx], pos + n_regexes + re_idx,
+                     pos + re_idx,
+                     i_rec.headword if idx2 == 0 and re_idx == n_regexes - 1
+                                    else None)
+                    for re_idx in range(n_regexes)))
+    return groups
 
-def _worker_init(match_file, idiom_readonly, idiom_counts):
-    global _IDIOM_READONLY
-    global _IDIOM_COUNTS
+def _return_results(_):
+    return _COMM_WORKERS.reduce(_COUNTS, op=_sum_counts)
+
+def _worker_init(match_file, groups, n_counts):
+    global _GROUPS
+    global _COUNTS
+    global _GROUPS_BY_LITERAL
+    global _FIRST_LITERALS_BY_PREFIX
+    global _SHORT_FIRST_LITERALS
     global _MATCH_FILE
     global _COMM_WORKERS
 
-    _IDIOM_READONLY = idiom_readonly
-    _IDIOM_COUNTS = idiom_counts
+    _GROUPS = groups
+    _COUNTS = [0] * n_counts
+    _GROUPS_BY_LITERAL = {}
+    for group_idx, group in enumerate(groups):
+        for literal in group[0][0]:
+            _GROUPS_BY_LITERAL.setdefault(literal, []).append(group_idx)
+    _FIRST_LITERALS_BY_PREFIX = {}
+    _SHORT_FIRST_LITERALS = []
+    for literal in _GROUPS_BY_LITERAL:
+        if len(literal) < _PREFIX_LEN:
+            _SHORT_FIRST_LITERALS.append(literal)
+        else:
+            _FIRST_LITERALS_BY_PREFIX.setdefault(
+                    literal[:_PREFIX_LEN], []).append(literal)
     _MATCH_FILE = match_file
     _COMM_WORKERS = get_comm_workers()
 
@@ -461,39 +697,101 @@ def _worker_init(match_file, idiom_readonly, idiom_counts):
     #_process_corpus_row(x[1].split('\t')[1])
 #    _process_corpus_row(x)
 
+def _search(regex, x, found):
+    '''Return whether `regex` is in `x`, using the results in `found`.'''
+    try:
+        return found[regex]
+    except KeyError:
+        ret_val = found[regex] = regex.search(x) is not None
+        return ret_val
+
 def _process_corpus_row(x):
     ret_val = []
+    # Most case-insensitive regexes are searched for in the lower-cased
+    # sentence (see `_compile_ic`).
+    x_folded = x.translate(_FOLD_TABLE).lower()
+    # Search results for the regexes already searched for in this sentence,
+    # since many regexes (e.g., for 'SICH' or 'HABEN') are in many groups.
+    # The two searches are kept apart as the same pattern object can be in
+    # both `regexes` and `ic_regexes`.
+    found = {}
+    ic_found = {}
     #x_list = x.split(' ', maxsplit=1)
     #wgt = int(x_list[0])
     #text = x_list[1]
-    for idx, row_rec in enumerate(_IDIOM_READONLY):
-        for idx2, i_rec in enumerate(row_rec):
-            case_sensitive_still_match = True
-            for re_idx, regex in enumerate(i_rec.ic_regexes):
-                len_results = len(i_rec.ic_regexes)
-                if regex.search(x):
-                    _IDIOM_COUNTS[idx][idx2].ic_results[re_idx] += 1
-                    if (case_sensitive_still_match
-                        and i_rec.regexes[re_idx].search(x)):
-                        if idx2 == 0 and re_idx + 1 == len_results:
-                            if _MATCH_FILE is not None:
-                                ret_val.append(
-         f'{_IDIOM_READONLY[idx][idx2].headword}\t{x}')
-                        _IDIOM_COUNTS[idx][idx2].results[re_idx] += 1
-                    else:
-                        case_sensitive_still_match = False
+    # The globals and methods used in the loops are bound to local names,
+    # which are faster to look up.
+    x_contains = x_folded.__contains__
+    counts = _COUNTS
+    groups = _GROUPS
+    groups_by_literal = _GROUPS_BY_LITERAL
+    write_matches = _MATCH_FILE is not None
+    # `filter` calls `x_folded.__contains__` for each literal without
+    # running any Python code. The empty literal is in every sentence.
+    # Finding the prefixes in the sentence first is much faster than
+    # searching for each of the literals.
+    prefixes = {x_folded[i:i + _PREFIX_LEN]
+                for i in range(len(x_folded) - _PREFIX_LEN + 1)}
+    first_literals = list(filter(x_contains, _SHORT_FIRST_LITERALS))
+    for prefix in prefixes.intersection(_FIRST_LITERALS_BY_PREFIX):
+        first_literals.extend(filter(x_contains,
+                                     _FIRST_LITERALS_BY_PREFIX[prefix]))
+    group_indices = []
+    for literal in first_literals:
+        group_indices.extend(groups_by_literal[literal])
+    # Sort so that matches are returned in the same order as the groups.
+    for group_idx in sorted(set(group_indices)):
+        case_sensitive_still_match = True
+        for (literals, ic_regex, ic_lower_cased, regex, ic_result_pos,
+             result_pos, headword) in groups[group_idx]:
+            if (any(map(x_contains, literals))
+                and _search(ic_regex, x_folded if ic_lower_cased else x,
+                            ic_found)):
+                counts[ic_result_pos] += 1
+                if (case_sensitive_still_match
+                    and _search(regex, x, found)):
+                    if headword is not None and write_matches:
+                        ret_val.append(f'{headword}\t{x}')
+                    counts[result_pos] += 1
                 else:
-                    break
+                    case_sensitive_still_match = False
+            else:
+                break
+
     if not ret_val:
         ret_val = None
     return ret_val
 
+def _process_corpus_rows(lines):
+    '''Process a batch of corpus lines and return the matches or None.
+
+    Processing lines in batches means the workers send back one result per
+    batch instead of one per line, and most batches have no matches. The
+    matches are returned as a single string with a line for each match, so
+    only one object is sent back and the text can be written with one call.
+    '''
+    ret_val = []
+    for line in lines:
+        result = _process_corpus_row(line)
+        if result is not None:
+            ret_val.extend(result)
+    if not ret_val:
+        return None
+    ret_val.append('')
+    return '\n'.join(ret_val)
+
+def _batches(iterable, size):
+    '''Yield lists of `size` consecutive items (the last may be shorter).'''
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
 def _process_idiom(headword, re1, re2, prob_verb_stems, verb_forms,
-                   idiom_readonly, idiom_counts):
+                   idiom_readonly):
     _process_one_re(headword, re1, prob_verb_stems, verb_forms,
-                    idiom_readonly, idiom_counts, 1)
+                    idiom_readonly, 1)
     _process_one_re(headword, re2, prob_verb_stems, verb_forms,
-                    idiom_readonly, idiom_counts, 2)
+                    idiom_readonly, 2)
     #return {'re1': process_one_re(ctr, note_id, headword, re1, 1),
     #        're2': process_one_re(ctr, note_id, headword, re2, 2)}
 
@@ -504,39 +802,40 @@ def _add_to_prob_verb_stems(prob_verb_stems, regex, headword):
         prob_verb_stems[regex] = [headword]
 
 def _write_prob_verb_stems(prob_verb_stems, pvs_output_file):
-    pvs_df = pd.DataFrame.from_dict(prob_verb_stems, orient='index')
-    pvs_df = pvs_df.sort_index()
-    pvs_df.to_csv(pvs_output_file, sep='\t', quoting=csv.QUOTE_MINIMAL)
+    '''Write a row for each stem with the headwords it was found in.
 
-def _reduce_counts(rcvd, idiom_counts):
-    '''Add the results from a worker to total.
+    The rows are sorted by stem and padded to the same length, with a header
+    row of column numbers.
     '''
-    for idx1, idiom_row in enumerate(rcvd):
-        for idx2, irec in enumerate(idiom_row):
-            for idx3, val in enumerate(irec.results):
-                idiom_counts[idx1][idx2].results[idx3] += val
-            for idx3, val in enumerate(irec.ic_results):
-                idiom_counts[idx1][idx2].ic_results[idx3] += val
+    n_cols = max(map(len, prob_verb_stems.values()), default=0)
+    with open(pvs_output_file, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f, delimiter='\t', quoting=csv.QUOTE_MINIMAL,
+                            lineterminator='\n')
+        writer.writerow([''] + list(range(n_cols)))
+        for stem in sorted(prob_verb_stems):
+            headwords = prob_verb_stems[stem]
+            writer.writerow([stem] + headwords
+                            + [''] * (n_cols - len(headwords)))
 
 def _sum_counts(x, y):
-    '''Add the results from two ragged arrays.
+    '''Add the results from two flat lists of counts.
     '''
-    _reduce_counts(x, y)
-    return y
+    return [x_val + y_val for x_val, y_val in zip(x, y)]
 
 def default_line_generator(corpus_files, max_rows_per_file):
     all_file_ctr = 0
     #for file_index, file in enumerate(corpus_files):
     for file in corpus_files:
         with open(file, encoding='utf-8') as f:
-            for ctr, line in enumerate(f):
-                if (max_rows_per_file is not None
-                    and ctr >= max_rows_per_file): break
-                if all_file_ctr % 1000 == 0:
-                    print(f"Input line: {all_file_ctr}")
-                all_file_ctr += 1
+            # Lines are read and stripped in blocks so the loop over lines
+            # is done by `map` instead of in Python.
+            lines = islice(f, max_rows_per_file)
+            while block := list(map(str.rstrip, islice(lines, 1000))):
+                for ctr in range(-all_file_ctr % 1000, len(block), 1000):
+                    print(f"Input line: {all_file_ctr + ctr}")
+                all_file_ctr += len(block)
                 #yield file_index, line.rstrip()
-                yield line.rstrip()
+                yield from block
 
 def mpi_count_regexes(df, output_file, chunksize, verb_forms=None,
                   n_cores=None,
@@ -561,18 +860,16 @@ def mpi_count_regexes(df, output_file, chunksize, verb_forms=None,
         `verb_search_cat_N`, `n_cum_N`, `n_seq_N`, `n_ic_cum_N`,
         `n_ic_seq_N`, where `N` is replaced by 1 and 2.
     chunksize : int
-        Chunk size to use when mapping the tasks (of processing corpus
-        lines).
+        Number of corpus lines in each task when mapping the tasks. Each
+        task returns its matches in a single result.
     verb_forms : Dict[str, str]
         Dictionary where the key is the regex placeholder and the value
         is the replacement string. This is primarily used to replace
         a placeholder with a regex that captures the various declined form
         of a verb. We use the convention that a placeholder should consist
-        of capital letters or underscores, and an error is generated if
-        there is a regex with this format not in this dict. However, we do
-        not currently give an error if a key in this dict does not satisfy
-        the capital-or-underscore requirement, but we recommend adhering to
-        this convention.
+        of capital letters (A-Z, Ä, Ö, Ü, ẞ) or underscores, and an error
+        is generated if there is a regex with this format not in this dict
+        or if a key in this dict does not have this format.
     n_cores : None
         Not used. Must be `None`. The number of workers is determined
         automatically by MPIPoolExecutor.
@@ -641,45 +938,50 @@ def mpi_count_regexes(df, output_file, chunksize, verb_forms=None,
 
     prob_verb_stems = {}
     idiom_readonly = []
-    idiom_counts = []
-    for row in df[['headword','re1','re2']].values:
-        _process_idiom(headword=row[0], re1=row[1], re2=row[2],
+    for headword, re1, re2 in zip(df.headword, df.re1, df.re2):
+        _process_idiom(headword=headword, re1=re1, re2=re2,
                        prob_verb_stems=prob_verb_stems,
                        verb_forms=verb_forms,
-                       idiom_readonly=idiom_readonly,
-                       idiom_counts=idiom_counts)
+                       idiom_readonly=idiom_readonly)
     if pvs_output_file is not None:
         _write_prob_verb_stems(prob_verb_stems, pvs_output_file)
 
+    positions, n_counts = _count_positions(idiom_readonly)
+    groups = _worker_groups(idiom_readonly, positions)
+    # Identical regexes share a compiled pattern (see `_compile`).
+    patterns = [pattern for group in groups
+                        for stage in group for pattern in (stage[1], stage[3])]
+    print(f'{len(set(patterns))} distinct compiled regexes for '
+          f'{len(patterns)} regexes')
+    # Stays all zeros if there are no workers to return results.
+    counts = [0] * n_counts
     with MPIPoolExecutor(
              max_workers=n_cores,
              initializer=_worker_init,
-             initargs=(match_file, idiom_readonly, idiom_counts)
+             initargs=(match_file, groups, n_counts)
                         ) as executor:
         if executor is not None:
             buffersize = executor.num_workers*2
+            batches = _batches(line_generator(), chunksize)
             if match_file is None:
-                for _ in executor.map(_process_corpus_row,
-                                  line_generator(), chunksize=chunksize,
-                                  buffersize=buffersize):
+                for _ in executor.map(_process_corpus_rows, batches,
+                                      buffersize=buffersize):
                     pass
             else:
                 with open(match_file, 'w', encoding='utf-8') as f:
-                    for result in executor.map(_process_corpus_row,
-                                  line_generator(), chunksize=chunksize,
-                                  buffersize=buffersize):
+                    for result in executor.map(_process_corpus_rows, batches,
+                                               buffersize=buffersize):
                         if result is not None:
-                            for val in result:
-                                f.write(val + '\n')
+                            f.write(result)
 
-            for counts in executor.map(_return_results,
+            for result in executor.map(_return_results,
                                    [0]*executor.num_workers, chunksize=1):
-                if counts is not None:
-                    idiom_counts = counts
+                if result is not None:
+                    counts = result
                     break
 
-    ret_val = [ _fmt_output(x, idiom_readonly, idiom_counts)
-                for x in range(len(idiom_counts)) ]
+    ret_val = [ _fmt_output(x, idiom_readonly, counts, positions)
+                for x in range(len(idiom_readonly)) ]
 
     varlist = ['verb_search_cat','n_cum','n_seq','n_ic_cum','n_ic_seq']
     indices = ['1','2']
@@ -125,6 +125,14 @@ OK_DICT = {
   'macht nichts': "Same reason as 'alt werden'",
 }
 
+# Formats of `n_manual_cmt` cross-checked in `check_comment_math`. These are
+# compiled once here since the function is called for every record.
+CMT_ZERO_IN_SAMPLE_RE = re.compile(
+                      r'^(\d+)/(\d+)\*(\d+) found, so assume 0\.5 matches')
+CMT_ALL_MATCHES_RE = re.compile(r'^(\d+)/(\d+)[;$]')
+CMT_SAMPLE_RE = re.compile(r'^=(\d+)/(\d+)\*(\d+)')
+CMT_ASSUME_HALF_RE = re.compile(r'assume 0\.5')
+
 def hw_to_title(x):
     title = urllib.parse.quote(x.replace(' ','_'))
     return f'https://de.wiktionary.org/wiki/{title}'
@@ -171,12 +179,13 @@ def check_main_form_most_freq(df_, var):
                   how='left',left_on='cf_man', right_on='cf_man',
                   validate='m:1')
     df['mf_wk'] = df.mf_wk_y.fillna('')
+    # Used in both listings, so only cast once.
+    n_final_man = df.n_final_man.astype(float)
 
     # Listing 2
     listing2 = ((df[var] != '') &
                 (df.mf_wk != '') &
-                (df.n_final_man.astype(float) <=
-                 df.n_final_wk.astype(float)) &
+                (n_final_man <= df.n_final_wk.astype(float)) &
                 (df[var] != df.mf_wk))
     local_le_dewk = df[listing2]
 
@@ -191,7 +200,7 @@ def check_main_form_most_freq(df_, var):
 
     listing3 = ((df.n_final != '') & (df.n_final_man != '')
          & (~df.headword_x.isin(OK_DICT))
-         & (df.n_final.astype(float) >= BUFFER + df.n_final_man.astype(float)))
+         & (df.n_final.astype(float) >= BUFFER + n_final_man))
     if listing3.any():
         print(df[listing3][['headword_x','cf_man',
                             'dewk_main_form_on_variant','n_final',
@@ -202,22 +211,16 @@ def check_main_form_most_freq(df_, var):
     print_geq_cf(df, var)
 
 LVW_DICT = {}
-def add_to_lvw_dict(x):
-    x_list = x.split(':')
-    nebenform = x_list[0]
-    mainform = x_list[1]
-    if mainform:
-        if nebenform in LVW_DICT:
-            raise ValueError(f'{nebenform=} in dict twice')
-        else:
-            LVW_DICT[nebenform] = mainform
-
 def read_lemmaverweis():
     lvw_df = pd.read_csv('Lemmaverweis/output_lvw.txt',
                    sep='\t', quoting=csv.QUOTE_NONE)
     lvw_df['lemma_main_form_1'] = lvw_df.lemma_main_form_1.fillna('')
-    lvw_df['Value'] = lvw_df.headword + ':' + lvw_df.lemma_main_form_1
-    lvw_df.Value.map(add_to_lvw_dict)
+    lvw_df = lvw_df[lvw_df.lemma_main_form_1 != '']
+    dup_nebenform = lvw_df.headword[lvw_df.headword.duplicated()]
+    if not dup_nebenform.empty:
+        nebenform = dup_nebenform.iloc[0]
+        raise ValueError(f'{nebenform=} in dict twice')
+    LVW_DICT.update(zip(lvw_df.headword, lvw_df.lemma_main_form_1))
 
 def check_both_languages(df_):
     en_df = pd.read_csv('other_lang/en/en.txt', sep='\t',
@@ -320,14 +323,10 @@ def check_comment_math(n_cum_1, n_manual, n_manual_cmt):
     ValueError if any check fails.
     '''
 
-    re1 = re.compile(r'^(\d+)/(\d+)\*(\d+) found, so assume 0\.5 matches')
-    result1 = re1.search(n_manual_cmt)
-    re2 = re.compile(r'^(\d+)/(\d+)[;$]')
-    result2 = re2.search(n_manual_cmt)
-    re3 = re.compile(r'^=(\d+)/(\d+)\*(\d+)')
-    result3 = re3.search(n_manual_cmt)
-    re4 = re.compile(r'assume 0\.5')
-    result4 = re4.search(n_manual_cmt)
+    result1 = CMT_ZERO_IN_SAMPLE_RE.search(n_manual_cmt)
+    result2 = CMT_ALL_MATCHES_RE.search(n_manual_cmt)
+    result3 = CMT_SAMPLE_RE.search(n_manual_cmt)
+    result4 = CMT_ASSUME_HALF_RE.search(n_manual_cmt)
 
     if result1:
         if int(n_cum_1) != int(result1.group(3)):
@@ -409,8 +408,8 @@ counts_df = pd.read_csv(COUNTS_FILE, sep='\t', quoting=csv.QUOTE_NONE,
 # can follow the instructions in `run_wikwork.py`.
 
 read_lemmaverweis()
-counts_df['dewk_main_form_on_variant'] = counts_df.headword.map(
-    lambda x: LVW_DICT.get(x, ''))
+counts_df['dewk_main_form_on_variant'] = (
+    counts_df.headword.map(LVW_DICT).fillna(''))
 
 manual_df = pd.read_csv(MANUAL_FILE, sep='\t', quoting=csv.QUOTE_NONE,
                 usecols=['headword','orig order','re1','re2',
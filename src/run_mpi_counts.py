@@ -70,12 +70,11 @@ if __name__ == '__main__':
                            quoting=csv.QUOTE_NONE, nrows=idiom_rows)
 
     idiom_df['ID'] = idiom_df['orig order']
-    vf_df = pd.read_csv('input/endehw_verb_forms.txt', sep='\t',
-                        quoting=csv.QUOTE_NONE)
-    vf_df['replacement'] = vf_df.replacement.fillna('')
-    verb_forms = {}
-    for row in vf_df[['placeholder','replacement']].values:
-        verb_forms[row[0]] = row[1]
+    with open('input/endehw_verb_forms.txt', encoding='utf-8',
+              newline='') as f:
+        reader = csv.DictReader(f, delimiter='\t', quoting=csv.QUOTE_NONE)
+        verb_forms = {row['placeholder']: row['replacement']
+                      for row in reader}
 
     # passing a line_generator is a bit faster than using the default
     # constructed by passing `corpus_files` and `max_rows_per_file`.
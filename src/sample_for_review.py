@@ -73,10 +73,16 @@ idiom_df = idiom_df[idiom_df.n_manual_sampsize != '']
 match_df = pd.read_csv(MATCH_FILE, sep='\t', header=None,
                        names=['headword','text'], quoting=csv.QUOTE_NONE)
 match_df = match_df.sort_values(['headword','text'])
+# Split the matches by headword once instead of selecting from all the
+# matches for each idiom. The groups keep the sorted order, so the samples
+# are the same.
+matches_by_headword = {headword: group[['text']] for headword, group
+                       in match_df.groupby('headword', sort=False)}
+no_matches = match_df.iloc[:0][['text']]
 
 def process_idiom(headword, n_manual_sampsize, note_id):
     file_prefix = headword.replace(' ','_')
-    matches = match_df[match_df.headword == headword][['text']]
+    matches = matches_by_headword.get(headword, no_matches)
     matches.to_csv(os.path.join(OUTPUT_DIR, f"{file_prefix}.txt"),
                    sep='\t', header=False, index=False,
                    quoting=csv.QUOTE_NONE)
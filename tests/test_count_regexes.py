@@ -0,0 +1,34 @@
+'''Regression checks for case-insensitive searches in `count_regexes`.'''
+
+import csv
+import os
+import re
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import count_regexes as cr  # pylint: disable=wrong-import-position
+
+
+def _counts(tmp_path, regex, lines):
+    df = pd.DataFrame({'headword': ['x'], 're1': [regex], 're2': ['']})
+    output_file = tmp_path / 'out.txt'
+    cr.count_regexes(df=df, output_file=output_file, chunksize=5,
+                     verb_forms={}, n_cores=0,
+                     line_generator=lambda: iter(lines))
+    out = pd.read_csv(output_file, sep='\t', quoting=csv.QUOTE_NONE)
+    return out.loc[0, 'n_cum_1'], out.loc[0, 'n_ic_cum_1']
+
+
+def test_scoped_flag_group_searched_in_original(tmp_path):
+    regex = r'\b(?-i:Hund) bellt'
+    assert cr._compile_ic(regex).flags & re.IGNORECASE
+    assert _counts(tmp_path, regex, ['Der Hund bellt.']) == (1, 1)
+
+
+def test_octal_escape_searched_in_original(tmp_path):
+    regex = r'\b\101pfel'
+    assert cr._compile_ic(regex).flags & re.IGNORECASE
+    assert _counts(tmp_path, regex, ['Ein Apfel.', 'ein apfel.']) == (1, 2)